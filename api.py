@@ -1,10 +1,63 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Path
+from pydantic import BaseModel, conint
+from typing import List, Tuple
 import sqlite3
 import os
 
 app = FastAPI(title="Tender Scraper API", description="API для получения данных о тендерах")
 
 DB_NAME = "tenders.db"
+BATCH_MAX_ITEMS = 500
+# Лимит SQLite на число параметров в запросе (SQLITE_MAX_VARIABLE_NUMBER) в старых сборках — 999
+BATCH_CHUNK_SIZE = 900
+# Максимальное значение INTEGER в SQLite
+SQLITE_MAX_INT = 2 ** 63 - 1
+
+# Поля пакетного запроса и соответствующие им индексируемые колонки
+BATCH_LOOKUP_COLUMNS = {"ids": "id", "numbers": "tender_number", "urls": "url"}
+
+
+class TenderBatchRequest(BaseModel):
+    ids: List[conint(ge=1, le=SQLITE_MAX_INT)] = []
+    numbers: List[str] = []
+    urls: List[str] = []
+
+
+def _fetch_tenders(query: str, params: tuple) -> List[dict]:
+    """Выполняет запрос к таблице тендеров и сериализует строки в словари."""
+    if not os.path.exists(DB_NAME):
+        raise HTTPException(status_code=500, detail=f"База данных {DB_NAME} не найдена. Сначала запустите скрапинг.")
+
+    try:
+        conn = sqlite3.connect(DB_NAME)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError as e:
+        if "no such column" in str(e):
+            raise HTTPException(status_code=500, detail=f"Схема базы данных {DB_NAME} устарела ({e}). "
+                                                        f"Выполните: python main.py --output {DB_NAME} --migrate")
+        raise HTTPException(status_code=500, detail=f"Ошибка работы с базой данных: {e}")
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка работы с базой данных: {e}")
+    return [dict(row) for row in rows]
+
+
+def _build_batch_query(lookups: List[Tuple[str, object]]) -> Tuple[str, tuple]:
+    """Строит один запрос вида `id IN (...) OR tender_number IN (...) OR url IN (...)` по парам (колонка, значение)."""
+    values_by_column = {}
+    for column, value in lookups:
+        values_by_column.setdefault(column, []).append(value)
+
+    conditions = []
+    params = []
+    for column, values in values_by_column.items():
+        placeholders = ', '.join(['?' for _ in values])
+        conditions.append(f"{column} IN ({placeholders})")
+        params.extend(values)
+    return f"SELECT * FROM tenders WHERE {' OR '.join(conditions)}", tuple(params)
 
 
 @app.get("/tenders", summary="Получить список тендеров")
@@ -14,22 +67,61 @@ async def get_tenders(limit: int = 10, offset: int = 0):
     - **limit**: Максимальное количество тендеров (по умолчанию 10).
     - **offset**: Смещение для пагинации (по умолчанию 0).
     """
-    if not os.path.exists(DB_NAME):
-        raise HTTPException(status_code=500, detail=f"База данных {DB_NAME} не найдена. Сначала запустите скрапинг.")
+    return _fetch_tenders("SELECT * FROM tenders LIMIT ? OFFSET ?", (limit, offset))
 
-    try:
-        conn = sqlite3.connect(DB_NAME)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM tenders LIMIT ? OFFSET ?", (limit, offset))
-        rows = cursor.fetchall()
+@app.get("/tenders/by-number/{number}", summary="Получить тендер по номеру")
+async def get_tender_by_number(number: str):
+    """
+    Возвращает тендер по его номеру на rostender.info, например `85583662`.
+    Если тендер сохранен несколько раз (повторный скрапинг), возвращается самая новая запись.
+    """
+    tenders = _fetch_tenders("SELECT * FROM tenders WHERE tender_number = ? ORDER BY id DESC LIMIT 1", (number,))
+    if not tenders:
+        raise HTTPException(status_code=404, detail=f"Тендер с номером {number} не найден.")
+    return tenders[0]
 
-        tenders = [dict(row) for row in rows]
 
-        conn.close()
-        return tenders
-    except sqlite3.Error as e:
-        raise HTTPException(status_code=500, detail=f"Ошибка работы с базой данных: {e}")
+@app.get("/tenders/{tender_id}", summary="Получить тендер по id")
+async def get_tender(tender_id: int = Path(..., ge=1, le=SQLITE_MAX_INT)):
+    """
+    Возвращает тендер по его идентификатору в базе данных.
+    """
+    tenders = _fetch_tenders("SELECT * FROM tenders WHERE id = ?", (tender_id,))
+    if not tenders:
+        raise HTTPException(status_code=404, detail=f"Тендер с id {tender_id} не найден.")
+    return tenders[0]
+
+
+@app.post("/tenders/batch", summary="Получить несколько тендеров за один запрос")
+async def get_tenders_batch(request: TenderBatchRequest):
+    """
+    Возвращает тендеры по спискам id, номеров и ссылок.
+    - **ids**, **numbers**, **urls**: Значения для поиска (в сумме не более BATCH_MAX_ITEMS уникальных значений).
+
+    Все значения ищутся одним запросом `IN (...)`, который разбивается на части только при превышении
+    лимита параметров SQLite. Ответ содержит найденные тендеры, отсортированные по id, и значения,
+    для которых тендер не найден. Запись, найденная по нескольким значениям, возвращается один раз;
+    если тендер сохранен несколько раз (повторный скрапинг), возвращаются все его записи.
+    """
+    requested = {field: list(dict.fromkeys(getattr(request, field))) for field in BATCH_LOOKUP_COLUMNS}
+    total = sum(len(values) for values in requested.values())
+    if total > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Можно запросить не более {BATCH_MAX_ITEMS} тендеров за раз, передано {total}.")
+
+    lookups = [(BATCH_LOOKUP_COLUMNS[field], value) for field, values in requested.items() for value in values]
+    found = {}
+    for start in range(0, len(lookups), BATCH_CHUNK_SIZE):
+        query, params = _build_batch_query(lookups[start:start + BATCH_CHUNK_SIZE])
+        for tender in _fetch_tenders(query, params):
+            found[tender["id"]] = tender
+
+    missing = {}
+    for field, values in requested.items():
+        column = BATCH_LOOKUP_COLUMNS[field]
+        found_values = {tender.get(column) for tender in found.values()}
+        missing[field] = [value for value in values if value not in found_values]
+
+    return {"tenders": [found[tender_id] for tender_id in sorted(found)], "missing": missing}
 
-# Для запуска: python -m uvicorn api:app --reload
\ No newline at end of file
+# Для запуска: python -m uvicorn api:app --reload
@@ -7,6 +7,8 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs, urlencode
 import asyncio
 import logging
+import os
+import re
 
 
 # --- Настройка логирования ---
@@ -33,6 +35,9 @@ RUSSIAN_TO_ENGLISH_KEYS = {
     "okpd2": "okpd2"
 }
 
+# Номер тендера без служебного текста и даты, отдельная индексируемая колонка для поиска через API
+TENDER_NUMBER_COLUMN = "tender_number"
+
 
 async def fetch_page_content(client: httpx.AsyncClient, url: str) -> Optional[BeautifulSoup]:
     """Асинхронно загружает содержимое страницы."""
@@ -258,20 +263,25 @@ def save_to_csv(data: List[Dict], filename: str):
     logger.info(f"Данные сохранены в {filename}")
 
 
-def save_to_sqlite(data: List[Dict], db_name: str = "tenders.db"):
-    """Сохраняет данные в SQLite базу данных."""
-    if not data:
-        logger.warning("Нет данных для сохранения в SQLite.")
-        return
+def extract_tender_number(number_text: Optional[str]) -> Optional[str]:
+    """Извлекает номер тендера из строки вида 'Тендер  №85583662 от 03.08.25'."""
+    if not number_text:
+        return None
+    match = re.search(r'№\s*(\d+)', number_text)
+    if match:
+        return match.group(1)
+    # Формат без знака номера: берем первую последовательность цифр
+    match = re.search(r'\d+', number_text)
+    return match.group(0) if match else None
 
-    # Определяем английские ключи для колонок
-    english_keys = list(RUSSIAN_TO_ENGLISH_KEYS.values())
 
-    conn = sqlite3.connect(db_name)
+def migrate_sqlite(conn: sqlite3.Connection):
+    """Создает таблицу тендеров и приводит схему БД к актуальной: колонка с номером тендера и индексы."""
+    english_keys = list(RUSSIAN_TO_ENGLISH_KEYS.values())
     cursor = conn.cursor()
 
     # Создаем таблицу с английскими именами колонок
-    columns_def = ", ".join([f"{key} TEXT" for key in english_keys])
+    columns_def = ", ".join([f"{key} TEXT" for key in english_keys + [TENDER_NUMBER_COLUMN]])
     create_table_sql = f'''
         CREATE TABLE IF NOT EXISTS tenders (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -280,15 +290,47 @@ def save_to_sqlite(data: List[Dict], db_name: str = "tenders.db"):
     '''
     cursor.execute(create_table_sql)
 
+    # БД, созданные до появления колонки с номером: добавляем ее и заполняем из поля number
+    existing_columns = {row[1] for row in cursor.execute("PRAGMA table_info(tenders)")}
+    if TENDER_NUMBER_COLUMN not in existing_columns:
+        logger.info(f"Добавляем колонку {TENDER_NUMBER_COLUMN} в таблицу tenders.")
+        cursor.execute(f"ALTER TABLE tenders ADD COLUMN {TENDER_NUMBER_COLUMN} TEXT")
+        rows = cursor.execute("SELECT id, number FROM tenders").fetchall()
+        cursor.executemany(
+            f"UPDATE tenders SET {TENDER_NUMBER_COLUMN} = ? WHERE id = ?",
+            [(extract_tender_number(number), tender_id) for tender_id, number in rows]
+        )
+
+    # Индексы для поиска тендеров по номеру и ссылке через API
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_tenders_number ON tenders ({TENDER_NUMBER_COLUMN})")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tenders_url ON tenders (url)")
+    conn.commit()
+
+
+def save_to_sqlite(data: List[Dict], db_name: str = "tenders.db"):
+    """Сохраняет данные в SQLite базу данных."""
+    if not data:
+        logger.warning("Нет данных для сохранения в SQLite.")
+        return
+
+    # Определяем английские ключи для колонок
+    english_keys = list(RUSSIAN_TO_ENGLISH_KEYS.values())
+    columns = english_keys + [TENDER_NUMBER_COLUMN]
+
+    conn = sqlite3.connect(db_name)
+    cursor = conn.cursor()
+    migrate_sqlite(conn)
+
     for item in data:
         english_item = {}
         for ru_key, en_key in RUSSIAN_TO_ENGLISH_KEYS.items():
             english_item[en_key] = item.get(ru_key, "N/A")
+        english_item[TENDER_NUMBER_COLUMN] = extract_tender_number(english_item["number"])
 
-        values = [english_item[key] for key in english_keys]
+        values = [english_item[key] for key in columns]
 
-        placeholders = ', '.join(['?' for _ in english_keys])
-        columns_str = ', '.join(english_keys)
+        placeholders = ', '.join(['?' for _ in columns])
+        columns_str = ', '.join(columns)
 
         insert_sql = f'''
             INSERT OR REPLACE INTO tenders ({columns_str})
@@ -344,9 +386,22 @@ def main():
                         help='Максимальное количество тендеров для загрузки (по умолчанию 10)')
     parser.add_argument('--output', type=str, default='tenders.csv',
                         help='Имя выходного файла (CSV или SQLite .db/.sqlite)')
+    parser.add_argument('--migrate', action='store_true',
+                        help='Обновить схему и индексы существующей SQLite базы --output без скрапинга')
 
     args = parser.parse_args()
 
+    if args.migrate:
+        if not (args.output.endswith('.db') or args.output.endswith('.sqlite')):
+            parser.error("для --migrate укажите SQLite базу (.db/.sqlite) в --output")
+        if not os.path.exists(args.output):
+            parser.error(f"база данных {args.output} не найдена")
+        conn = sqlite3.connect(args.output)
+        migrate_sqlite(conn)
+        conn.close()
+        logger.info(f"Схема базы данных {args.output} обновлена")
+        return
+
     asyncio.run(scrape_tenders(args.max, args.output))
 
 if __name__ == '__main__':
@@ -10,17 +10,20 @@ import shutil
 client = TestClient(app)
 
 
-# --- Фикстуры ---
-@pytest.fixture(scope="function")
-def temp_db():
-    """Создает временную базу данных для тестов."""
+# --- Тестовые данные ---
+SAMPLE_DATA = [
+    ("http://example.com/1", "Тендер\xa0\xa0№85583662 от 03.08.25", "Customer A", "Subject A", "1000",
+     "01.02.2024 10:00", "Location A", "12.34.56", "85583662"),
+    ("http://example.com/2", "Тендер\xa0\xa0№85583657 от 03.08.25", "Customer B", "Subject B", "2000",
+     "02.02.2024 11:00", "Location B", "78.90.12", "85583657"),
+    ("http://example.com/3", "Тендер\xa0\xa0№85583659 от 03.08.25", "Customer C", "Subject C", "3000",
+     "03.02.2024 12:00", "Location C", "34.56.78", "85583659"),
+]
 
-    # Создаем временную директорию
-    test_dir = tempfile.mkdtemp()
-    test_db_path = os.path.join(test_dir, DB_NAME)
 
-    # Создаем тестовую таблицу и данные
-    conn = sqlite3.connect(test_db_path)
+def create_test_db(db_path, rows):
+    """Создает БД с таблицей тендеров и заполняет ее переданными строками."""
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS tenders (
@@ -32,24 +35,30 @@ def temp_db():
             price TEXT,
             end_date TEXT,
             location TEXT,
-            okpd2 TEXT
+            okpd2 TEXT,
+            tender_number TEXT
         )
     ''')
-    sample_data = [
-        ("http://example.com/1", "T-001 01.01.2024", "Customer A", "Subject A", "1000", "01.02.2024 10:00",
-         "Location A", "12.34.56"),
-        ("http://example.com/2", "T-002 02.01.2024", "Customer B", "Subject B", "2000", "02.02.2024 11:00",
-         "Location B", "78.90.12"),
-        ("http://example.com/3", "T-003 03.01.2024", "Customer C", "Subject C", "3000", "03.02.2024 12:00",
-         "Location C", "34.56.78"),
-    ]
     cursor.executemany('''
-        INSERT INTO tenders (url, number, customer, subject, price, end_date, location, okpd2)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', sample_data)
+        INSERT INTO tenders (url, number, customer, subject, price, end_date, location, okpd2, tender_number)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
     conn.commit()
     conn.close()
 
+
+# --- Фикстуры ---
+@pytest.fixture(scope="function")
+def temp_db():
+    """Создает временную базу данных для тестов."""
+
+    # Создаем временную директорию
+    test_dir = tempfile.mkdtemp()
+    test_db_path = os.path.join(test_dir, DB_NAME)
+
+    # Создаем тестовую таблицу и данные
+    create_test_db(test_db_path, SAMPLE_DATA)
+
     # Сохраняем путь к оригинальному DB_NAME для восстановления
     original_db_name = DB_NAME
 
@@ -118,4 +127,161 @@ def test_get_tenders_db_not_found(missing_db):
     assert response.status_code == 500
     data = response.json()
     assert "detail" in data
-    assert "не найдена" in data["detail"]
\ No newline at end of file
+    assert "не найдена" in data["detail"]
+
+
+def test_get_tender_by_id(temp_db):
+    """Тест получения тендера по id."""
+    response = client.get("/tenders/2")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == 2
+    assert data["url"] == "http://example.com/2"
+
+
+def test_get_tender_by_id_not_found(temp_db):
+    """Тест получения несуществующего тендера по id."""
+    response = client.get("/tenders/100")
+    assert response.status_code == 404
+    assert "не найден" in response.json()["detail"]
+
+
+def test_get_tender_by_number(temp_db):
+    """Тест получения тендера по номеру без служебного текста и даты из поля number."""
+    response = client.get("/tenders/by-number/85583659")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["number"] == "Тендер\xa0\xa0№85583659 от 03.08.25"
+    assert data["url"] == "http://example.com/3"
+
+
+def test_get_tender_by_number_not_found(temp_db):
+    """Тест получения тендера по несуществующему номеру."""
+    response = client.get("/tenders/by-number/99999999")
+    assert response.status_code == 404
+
+
+def test_get_tenders_batch(temp_db):
+    """Тест пакетного получения тендеров по id, номерам и ссылкам."""
+    response = client.post("/tenders/batch", json={
+        "ids": [1, 100],
+        "numbers": ["85583657", "99999999"],
+        "urls": ["http://example.com/1", "http://example.com/3"],
+    })
+    assert response.status_code == 200
+    data = response.json()
+    # Тендер 1 найден и по id, и по ссылке, но возвращается один раз
+    assert [tender["id"] for tender in data["tenders"]] == [1, 2, 3]
+    assert data["missing"] == {"ids": [100], "numbers": ["99999999"], "urls": []}
+
+
+def test_get_tenders_batch_chunked(temp_db, monkeypatch):
+    """Тест пакетного запроса, разбиваемого на несколько запросов IN (...)."""
+    api_module = __import__('api', fromlist=['BATCH_CHUNK_SIZE'])
+    monkeypatch.setattr(api_module, "BATCH_CHUNK_SIZE", 2)
+    response = client.post("/tenders/batch", json={"ids": [3, 1, 4], "numbers": ["85583657", "99999999"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [tender["id"] for tender in data["tenders"]] == [1, 2, 3]
+    assert data["missing"] == {"ids": [4], "numbers": ["99999999"], "urls": []}
+
+
+def test_get_tenders_batch_too_many(temp_db):
+    """Тест пакетного запроса с превышением лимита."""
+    api_module = __import__('api', fromlist=['BATCH_MAX_ITEMS'])
+    response = client.post("/tenders/batch", json={"ids": list(range(1, api_module.BATCH_MAX_ITEMS + 2))})
+    assert response.status_code == 400
+
+
+def test_get_tenders_batch_duplicates_not_counted(temp_db):
+    """Тест того, что повторяющиеся значения не учитываются в лимите пакетного запроса."""
+    api_module = __import__('api', fromlist=['BATCH_MAX_ITEMS'])
+    response = client.post("/tenders/batch", json={"ids": [1] * (api_module.BATCH_MAX_ITEMS + 1)})
+    assert response.status_code == 200
+    assert [tender["id"] for tender in response.json()["tenders"]] == [1]
+
+
+def test_get_tender_db_not_found(missing_db):
+    """Тест получения тендера по id, когда БД отсутствует."""
+    response = client.get("/tenders/1")
+    assert response.status_code == 500
+    assert "не найдена" in response.json()["detail"]
+
+
+def test_get_tenders_after_db_recreated(temp_db):
+    """Тест того, что после пересоздания файла БД API возвращает новые данные."""
+    assert len(client.get("/tenders").json()) == 3
+
+    os.remove(temp_db)
+    create_test_db(temp_db, SAMPLE_DATA[:1])
+
+    data = client.get("/tenders").json()
+    assert [tender["url"] for tender in data] == ["http://example.com/1"]
+
+
+def test_lookups_use_indexes(tmp_path):
+    """Тест того, что поиск по номеру и ссылкам использует индексы БД, созданной скрапером."""
+    from main import save_to_sqlite
+    from api import _build_batch_query
+
+    db_path = str(tmp_path / "tenders.db")
+    save_to_sqlite([{"Ссылка": "http://example.com/1", "Номер и дата создания тендера": SAMPLE_DATA[0][1]}], db_path)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT tender_number FROM tenders").fetchone() == ("85583662",)
+
+    number_plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM tenders WHERE tender_number = ?",
+                               ("85583662",)).fetchall()
+    assert any("idx_tenders_number" in row[-1] for row in number_plan)
+
+    query, params = _build_batch_query([("id", 1), ("tender_number", "85583662"), ("url", "http://example.com/1")])
+    batch_plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall())
+    conn.close()
+    assert "idx_tenders_number" in batch_plan
+    assert "idx_tenders_url" in batch_plan
+    assert "SCAN tenders" not in batch_plan
+
+
+def test_get_tender_by_id_out_of_range(temp_db):
+    """Тест получения тендера по id, превышающему максимальное значение INTEGER в SQLite."""
+    response = client.get("/tenders/99999999999999999999")
+    assert response.status_code == 422
+
+
+def test_get_tenders_batch_id_out_of_range(temp_db):
+    """Тест пакетного запроса с id, превышающим максимальное значение INTEGER в SQLite."""
+    response = client.post("/tenders/batch", json={"ids": [2 ** 70]})
+    assert response.status_code == 422
+
+
+def test_get_tender_by_number_returns_newest(temp_db):
+    """Тест получения самой новой записи при повторном сохранении тендера."""
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO tenders (url, number, tender_number) VALUES (?, ?, ?)",
+                 ("http://example.com/1-new", SAMPLE_DATA[0][1], "85583662"))
+    conn.commit()
+    conn.close()
+
+    response = client.get("/tenders/by-number/85583662")
+    assert response.status_code == 200
+    assert response.json()["url"] == "http://example.com/1-new"
+
+
+def test_get_tender_by_number_db_not_migrated(temp_db):
+    """Тест поиска по номеру в БД, созданной до появления колонки tender_number."""
+    conn = sqlite3.connect(temp_db)
+    conn.execute("ALTER TABLE tenders DROP COLUMN tender_number")
+    conn.close()
+
+    response = client.get("/tenders/by-number/85583662")
+    assert response.status_code == 500
+    assert "--migrate" in response.json()["detail"]
+
+    response = client.post("/tenders/batch", json={"numbers": ["85583662"]})
+    assert response.status_code == 500
+    assert "--migrate" in response.json()["detail"]
+
+    # Поиск по ссылкам не зависит от новой колонки
+    response = client.post("/tenders/batch", json={"urls": ["http://example.com/1"]})
+    assert response.status_code == 200
+    assert [tender["id"] for tender in response.json()["tenders"]] == [1]
@@ -6,6 +6,8 @@ from main import (
     parse_tender_details,
     save_to_csv,
     save_to_sqlite,
+    migrate_sqlite,
+    extract_tender_number,
     RUSSIAN_TO_ENGLISH_KEYS
 )
 from bs4 import BeautifulSoup
@@ -148,4 +150,48 @@ def test_save_to_sqlite():
         assert row_dict["customer"] == "Покупатель 1"
 
     finally:
-        os.remove(tmp_db_name)
\ No newline at end of file
+        os.remove(tmp_db_name)
+
+
+def test_extract_tender_number():
+    """Тест извлечения номера тендера из строки заголовка."""
+    assert extract_tender_number("Тендер\xa0\xa0№85583662 от 03.08.25") == "85583662"
+    assert extract_tender_number("T-999") == "999"
+    assert extract_tender_number("N/A") is None
+    assert extract_tender_number(None) is None
+
+
+def test_migrate_sqlite_old_schema():
+    """Тест миграции БД, созданной до появления колонки с номером тендера и индексов."""
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmpfile:
+        tmp_db_name = tmpfile.name
+
+    try:
+        conn = sqlite3.connect(tmp_db_name)
+        conn.execute('''
+            CREATE TABLE tenders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT, number TEXT, customer TEXT, subject TEXT, price TEXT, end_date TEXT, location TEXT, okpd2 TEXT
+            )
+        ''')
+        conn.execute("INSERT INTO tenders (url, number) VALUES (?, ?)",
+                     ("http://test1.com", "Тендер\xa0\xa0№85583662 от 03.08.25"))
+        conn.commit()
+
+        migrate_sqlite(conn)
+
+        assert conn.execute("SELECT tender_number FROM tenders").fetchone() == ("85583662",)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(tenders)")}
+        assert {"idx_tenders_number", "idx_tenders_url"} <= indexes
+        conn.close()
+
+        # Новые данные дописываются в мигрированную таблицу
+        save_to_sqlite([{"Ссылка": "http://test2.com", "Номер и дата создания тендера": "Тендер №85583657 от 03.08.25"}],
+                       tmp_db_name)
+        conn = sqlite3.connect(tmp_db_name)
+        rows = conn.execute("SELECT url, tender_number FROM tenders ORDER BY id").fetchall()
+        conn.close()
+        assert rows == [("http://test1.com", "85583662"), ("http://test2.com", "85583657")]
+
+    finally:
+        os.remove(tmp_db_name)